@@ -1,17 +1,52 @@
+import os
+
+# Select the native (upb) protobuf backend before gtfs_realtime_pb2 is imported;
+# the pure-Python runtime is orders of magnitude slower at parsing the feed.
+os.environ.setdefault('PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION', 'upb')
+
 import dash
-from dash import html, dcc
+from dash import html, dcc, dash_table, Patch
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
+import orjson
 import plotly.graph_objects as go
-from dash.dependencies import Input, Output
-import requests
+from dash.dependencies import Input, Output, State
+import urllib3
 from google.transit import gtfs_realtime_pb2
-from datetime import datetime
-import pandas as pd
+from dataclasses import dataclass
+import hashlib
+import numpy as np
+import threading
 import time
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson's native serializer."""
+
+    # OPT_SERIALIZE_NUMPY lets the float32/int64 train columns be written
+    # straight from their buffers instead of element-by-element
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize the Dash app
 app = dash.Dash(__name__, title="Real-Time Train Tracker")
 server = app.server
 
+# Serialize callback responses with orjson instead of stdlib json
+# (plotly also picks up orjson automatically for figure serialization)
+server.json = OrjsonProvider(server)
+
+# Compress responses; the callback JSON (map figure + table rows) is by far
+# the largest payload, so make sure application/json is covered
+server.config['COMPRESS_MIMETYPES'] = [
+    'text/html', 'text/css', 'text/javascript',
+    'application/json', 'application/javascript'
+]
+Compress(server)
+
 # Define the GTFS-RT API endpoint
 LOCATIONS_URL = 'https://rata.digitraffic.fi/api/v1/trains/gtfs-rt-locations'
 
@@ -21,122 +56,311 @@ FINLAND_CENTER = {"lat": 62.2426, "lon": 25.7473}
 # Set the refresh interval in seconds
 REFRESH_INTERVAL = 30
 
-# Create a persistent session for requests with the exact headers known to work
-session = requests.Session()
-session.headers.update({
+# Columns shown in the sidebar train table
+TRAIN_TABLE_COLUMNS = [
+    {'name': 'Train', 'id': 'id'},
+    {'name': 'km/h', 'id': 'speed'},
+    {'name': 'Status', 'id': 'status'},
+    {'name': 'Position', 'id': 'position'},
+    {'name': 'Route', 'id': 'route'},
+]
+
+# The exact headers known to work against the Digitraffic API; keep-alive is
+# stated explicitly so the 30s polling cadence reuses the same TLS connection
+BASE_HEADERS = {
     'Accept': 'application/x-protobuf',
     'User-Agent': 'TrainTrackerTest/1.0',
-    'Digitraffic-User': 'TrainTrackerTest'
-})
+    'Digitraffic-User': 'TrainTrackerTest',
+    'Connection': 'keep-alive',
+    # The protobuf body compresses well; urllib3 inflates it on read()
+    'Accept-Encoding': 'gzip'
+}
+
+# Persistent connection pool for the single known endpoint. Talking to
+# urllib3 directly skips the cookie jar, hooks and response post-processing
+# that a requests.Session would run on every fetch.
+_HTTP = urllib3.PoolManager(
+    maxsize=1,
+    headers=BASE_HEADERS,
+    timeout=urllib3.Timeout(connect=5.0, read=20.0),
+    retries=urllib3.Retry(total=2, backoff_factor=0.5,
+                          status_forcelist=(502, 503, 504)),
+)
+
+@dataclass
+class TrainSoA:
+    """Column-oriented view of the active trains (one array per field).
+
+    Every consumer iterates the same few columns over all trains, so storing
+    them as parallel NumPy arrays avoids a Python dict per train.
+    """
+    ids: np.ndarray        # str
+    lats: np.ndarray       # float32, degrees
+    lons: np.ndarray       # float32, degrees
+    speeds: np.ndarray     # float32, km/h (0.0 = stopped)
+    moving: np.ndarray     # bool, True when speed > 0
+    timestamps: np.ndarray  # int64 epoch seconds (0 = unset)
+    trip_ids: np.ndarray   # str or None
+    route_ids: np.ndarray  # str or None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            ids=np.empty(0, dtype=object),
+            lats=np.empty(0, dtype=np.float32),
+            lons=np.empty(0, dtype=np.float32),
+            speeds=np.empty(0, dtype=np.float32),
+            moving=np.empty(0, dtype=bool),
+            timestamps=np.empty(0, dtype=np.int64),
+            trip_ids=np.empty(0, dtype=object),
+            route_ids=np.empty(0, dtype=object),
+        )
+
+
+# Server-side cache of the parsed train data. Callbacks read from here instead
+# of round-tripping the full train list through the browser's dcc.Store; only
+# a small {'ts': ...} token travels over the wire.
+_CACHE = {'ts': None, 'trains': TrainSoA.empty()}
+_CACHE_LOCK = threading.Lock()
+
+# Reused protobuf message; Clear() + parse avoids reallocating the message
+# tree and its repeated-entity containers on every refresh
+_FEED = gtfs_realtime_pb2.FeedMessage()
+
+# Validators of the last successfully parsed feed, used to skip re-parsing
+# (and the downstream render pipeline) when the upstream data hasn't changed
+_LAST_ETAG = None
+_LAST_MODIFIED = None
+_LAST_HASH = None
+
+
+def _update_cache(trains, ts):
+    """Store the latest parsed train data for the callbacks to read."""
+    with _CACHE_LOCK:
+        _CACHE['trains'] = trains
+        _CACHE['ts'] = ts
+
+
+def _read_cache():
+    """Return the cached (trains, ts) pair."""
+    with _CACHE_LOCK:
+        return _CACHE['trains'], _CACHE['ts']
+
+# Only one fetch may run at a time: the reused _FEED instance and the
+# validator globals are not thread-safe, and both the background poller and
+# the refresh-button callback call into the fetcher
+_FETCH_LOCK = threading.Lock()
 
-# Track last successful request time to manage request frequency
-last_request_time = 0
-MIN_REQUEST_INTERVAL = 5  # Minimum seconds between requests
 
 # Function to fetch and process GTFS-RT data
 def fetch_train_locations():
-    global last_request_time
-    
+    with _FETCH_LOCK:
+        return _fetch_train_locations_locked()
+
+
+def _fetch_train_locations_locked():
+    global _LAST_ETAG, _LAST_MODIFIED, _LAST_HASH
+
+    # One formatted stamp per fetch, taken at request time; every result and
+    # error path below reuses it instead of re-formatting the wall clock
+    now_str = time.strftime('%H:%M:%S')
+
     try:
-        # Enforce minimum time between requests to avoid rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - last_request_time
-        
-        if time_since_last_request < MIN_REQUEST_INTERVAL and last_request_time > 0:
-            wait_time = MIN_REQUEST_INTERVAL - time_since_last_request
-            print(f"Rate limit: waiting {wait_time:.2f} seconds...")
-            time.sleep(wait_time)
-        
-        # Simple and clear request with the working headers (set in the session)
+        # Simple and clear request with the working headers (set on the pool).
+        # Per-request headers replace the pool defaults, so merge explicitly.
         print(f"Fetching train data...")
-        response = session.get(LOCATIONS_URL, timeout=20)
-        
-        # Check status code explicitly
-        if response.status_code != 200:
-            print(f"Error: Received status code {response.status_code}")
-            return [], datetime.now().strftime('%H:%M:%S') + f" (Error: {response.status_code})"
-            
-        # Update the time of our last successful request
-        last_request_time = time.time()
-        
-        # Parse the protobuf message
-        feed = gtfs_realtime_pb2.FeedMessage()
-        feed.ParseFromString(response.content)
+        conditional = None
+        if _LAST_ETAG or _LAST_MODIFIED:
+            conditional = dict(BASE_HEADERS)
+            if _LAST_ETAG:
+                conditional['If-None-Match'] = _LAST_ETAG
+            if _LAST_MODIFIED:
+                conditional['If-Modified-Since'] = _LAST_MODIFIED
+        response = _HTTP.request('GET', LOCATIONS_URL,
+                                 preload_content=False, headers=conditional)
+        try:
+            # Feed unchanged since our last parse; keep serving the cache
+            if response.status == 304:
+                _, cached_ts = _read_cache()
+                return cached_ts
+
+            # Check status code explicitly
+            if response.status != 200:
+                print(f"Error: Received status code {response.status}")
+                update_time = now_str + f" (Error: {response.status})"
+                _update_cache(TrainSoA.empty(), update_time)
+                return update_time
+
+            # Read the body straight off the socket in one go, inflating the
+            # gzip transfer encoding as it streams
+            body = response.read(decode_content=True)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        finally:
+            response.release_conn()
+
+        # Some proxies strip ETags, so also compare a digest of the body;
+        # identical payloads keep the cached parse and its timestamp, which
+        # lets update_data short-circuit the whole render pipeline
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        if body_hash == _LAST_HASH:
+            _LAST_ETAG = etag
+            _LAST_MODIFIED = last_modified
+            _, cached_ts = _read_cache()
+            return cached_ts
+
+        # Parse the protobuf message into the reused instance
+        feed = _FEED
+        feed.Clear()
+        feed.ParseFromString(memoryview(body))
         
-        # Extract train data
-        train_data = []
+        # Extract train data into preallocated columns, filled by index and
+        # truncated to the number of entities that actually had a position
+        n_entities = len(feed.entity)
+        ids = np.empty(n_entities, dtype=object)
+        lats = np.empty(n_entities, dtype=np.float32)
+        lons = np.empty(n_entities, dtype=np.float32)
+        speeds = np.empty(n_entities, dtype=np.float32)
+        timestamps = np.empty(n_entities, dtype=np.int64)
+        trip_ids = np.empty(n_entities, dtype=object)
+        route_ids = np.empty(n_entities, dtype=object)
+
+        # The loop itself is interpreter-bound, so keep per-entity work to a
+        # minimum: flat control flow and the minimum of work per field
+        count = 0
         for entity in feed.entity:
-            if entity.HasField('vehicle'):
-                vehicle = entity.vehicle
-                
-                # Get basic information
-                train_id = vehicle.vehicle.id if vehicle.vehicle.HasField('id') else "Unknown"
-                
-                # Get position information
-                if vehicle.HasField('position'):
-                    lat = vehicle.position.latitude
-                    lon = vehicle.position.longitude
-                    
-                    # Speed might not be available for all trains
-                    if vehicle.position.HasField('speed'):
-                        speed_kmh = vehicle.position.speed * 3.6  # Convert m/s to km/h
-                    else:
-                        speed_kmh = None
-                else:
-                    continue  # Skip if no position data
-                
-                # Get timestamp
-                if vehicle.HasField('timestamp'):
-                    timestamp = datetime.fromtimestamp(vehicle.timestamp)
-                else:
-                    timestamp = None
-                
-                # Get trip info
-                trip_id = None
-                route_id = None
-                if vehicle.HasField('trip'):
-                    trip = vehicle.trip
-                    trip_id = trip.trip_id if trip.HasField('trip_id') else None
-                    route_id = trip.route_id if trip.HasField('route_id') else None
-                
-                # Add to train data
-                train_data.append({
-                    'id': train_id,
-                    'lat': lat,
-                    'lon': lon,
-                    'speed': speed_kmh,
-                    'timestamp': timestamp,
-                    'trip_id': trip_id,
-                    'route_id': route_id
-                })
-        
-        return train_data, datetime.now().strftime('%H:%M:%S')
-    except requests.exceptions.HTTPError as http_err:
-        error_msg = f"HTTP Error occurred: {http_err}"
+            # Scalar protobuf fields return well-defined defaults, so read
+            # them directly and only check presence of the submessages
+            if not entity.HasField('vehicle'):
+                continue
+            vehicle = entity.vehicle
+            if not vehicle.HasField('position'):
+                continue  # Skip if no position data
+            position = vehicle.position
+
+            ids[count] = vehicle.vehicle.id or "Unknown"
+            lats[count] = position.latitude
+            lons[count] = position.longitude
+            # An absent speed reads as 0.0, which we treat as "not moving";
+            # stored in m/s here and converted to km/h in one pass below
+            speeds[count] = position.speed
+
+            # Raw epoch seconds; 0 means the feed didn't set one. Formatting,
+            # if ever needed, happens at render time, not per fetch
+            timestamps[count] = vehicle.timestamp
+
+            # Trip info (empty string means unset)
+            trip = vehicle.trip
+            trip_ids[count] = trip.trip_id or None
+            route_ids[count] = trip.route_id or None
+
+            count += 1
+
+        # Sort by train ID once here; downstream filtering walks the columns
+        # in order, so the list callback no longer sorts on every render
+        order = np.argsort(ids[:count], kind='stable')
+        sorted_ids = ids[:count][order]
+        # Post-process the numeric column once, vectorized: unit conversion
+        # plus the moving/stopped classification both consumers need
+        speeds_kmh = speeds[:count][order] * np.float32(3.6)  # m/s -> km/h
+        trains = TrainSoA(
+            ids=sorted_ids,
+            # Rounded to 4 decimals (~11 m) - matches what the UI displays and
+            # keeps the serialized figure coordinates short on the wire
+            lats=np.round(lats[:count][order], 4),
+            lons=np.round(lons[:count][order], 4),
+            speeds=speeds_kmh,
+            moving=speeds_kmh > 0,
+            timestamps=timestamps[:count][order],
+            trip_ids=trip_ids[:count][order],
+            route_ids=route_ids[:count][order],
+        )
+
+        _LAST_ETAG = etag
+        _LAST_MODIFIED = last_modified
+        _LAST_HASH = body_hash
+
+        update_time = now_str
+        _update_cache(trains, update_time)
+        return update_time
+    except urllib3.exceptions.TimeoutError:
+        error_msg = "Timeout Error: The request timed out"
         print(error_msg)
-        # Check specifically for rate limiting or authentication issues
-        if hasattr(http_err, 'response') and http_err.response.status_code in [429, 403]:
-            print("Possible rate limiting or authentication issue. Adding delay before next request.")
-        return [], datetime.now().strftime('%H:%M:%S') + " (API Error)"
-    except requests.exceptions.ConnectionError:
+        update_time = now_str + " (Timeout)"
+    except urllib3.exceptions.MaxRetryError:
         error_msg = "Connection Error: Could not connect to the API"
         print(error_msg)
-        return [], datetime.now().strftime('%H:%M:%S') + " (Connection Error)"
-    except requests.exceptions.Timeout:
-        error_msg = "Timeout Error: The request timed out"
-        print(error_msg)
-        return [], datetime.now().strftime('%H:%M:%S') + " (Timeout)"
-    except requests.exceptions.RequestException as req_err:
+        update_time = now_str + " (Connection Error)"
+    except urllib3.exceptions.HTTPError as req_err:
         error_msg = f"Request Error: {req_err}"
         print(error_msg)
-        return [], datetime.now().strftime('%H:%M:%S') + " (Request Error)"
+        update_time = now_str + " (Request Error)"
     except Exception as e:
         error_msg = f"Unexpected error: {e}"
         print(error_msg)
-        return [], datetime.now().strftime('%H:%M:%S') + " (Error)"
+        update_time = now_str + " (Error)"
+
+    _update_cache(TrainSoA.empty(), update_time)
+    return update_time
+
+def _refresh_loop():
+    """Poll the API in the background so callbacks never block on HTTP."""
+    while True:
+        started = time.monotonic()
+        fetch_train_locations()
+        # Subtract the fetch duration so slow upstream responses don't drift
+        # the polling cadence (and with it the freshness of the cache)
+        time.sleep(max(1.0, REFRESH_INTERVAL - (time.monotonic() - started)))
+
+
+# Don't block cold start on the upstream API: the background poller does the
+# first fetch and the first interval tick picks it up. The polling cadence
+# also spaces out requests, so no extra rate limiting is needed.
+initial_time = time.strftime('%H:%M:%S')
+threading.Thread(target=_refresh_loop, daemon=True).start()
+
+def _initial_map_figure():
+    """Build the full map figure once, at layout time.
+
+    Refreshes only patch the trace arrays, so the static shell (marker
+    styling, hover config, map layout) is defined here and never resent.
+    """
+    fig = go.Figure(go.Scattermap(
+        lat=[],
+        lon=[],
+        # Markers only: per-point text labels cost a text node per train in
+        # the browser, and the ID is one hover away anyway
+        mode='markers',
+        marker=dict(
+            size=12,
+            color=[],
+            opacity=0.8
+        ),
+        hovertext=[],
+        hoverinfo='text',
+        hovertemplate='%{hovertext}<extra></extra>'  # Remove trace name from hover
+    ))
+
+    # Configure the map layout - using modern 'map' property instead of 'mapbox'
+    fig.update_layout(
+        map={
+            'style': "open-street-map",
+            'center': {'lat': FINLAND_CENTER['lat'], 'lon': FINLAND_CENTER['lon']},
+            'zoom': 5.5
+        },
+        margin={'l': 0, 'r': 0, 't': 0, 'b': 0},
+        uirevision='constant',  # Preserve zoom and center position on updates
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=12,
+            font_family="Segoe UI, Arial"
+        )
+    )
+    return fig
 
-# Get initial data
-initial_data, initial_time = fetch_train_locations()
 
 # App layout
 app.layout = html.Div([
@@ -159,7 +383,7 @@ app.layout = html.Div([
         html.Div([
             dcc.Graph(
                 id='train-map',
-                figure={},
+                figure=_initial_map_figure(),
                 style={'height': '100%'}
             ),
             # Legend for map markers
@@ -183,7 +407,41 @@ app.layout = html.Div([
                 html.Div("Enter exact train number for precise results", className="search-hint"),
             ], className="sidebar-header"),
             
-            html.Div(id="train-list", className="train-list")
+            html.Div([
+                # Virtualized table: only the visible rows are rendered, so
+                # large fleets no longer ship one DOM subtree per train
+                dash_table.DataTable(
+                    id='train-table',
+                    columns=TRAIN_TABLE_COLUMNS,
+                    data=[],
+                    virtualization=True,
+                    page_action='none',
+                    cell_selectable=False,
+                    # Keep the header visible while the virtualized body scrolls
+                    fixed_rows={'headers': True},
+                    # Filtering runs natively in the browser; the filter row
+                    # itself is hidden in CSS and fed from the search box
+                    filter_action='native',
+                    style_table={'height': '100%', 'overflowY': 'auto'},
+                    style_cell={
+                        'textAlign': 'left',
+                        'fontFamily': "'Segoe UI', Tahoma, Geneva, Verdana, sans-serif",
+                        'fontSize': '0.85rem',
+                        'padding': '0.4rem'
+                    },
+                    style_header={'fontWeight': 'bold'},
+                    style_data_conditional=[
+                        {
+                            'if': {'filter_query': '{status} = "Moving"', 'column_id': 'status'},
+                            'color': 'blue'
+                        },
+                        {
+                            'if': {'filter_query': '{status} = "Stopped"', 'column_id': 'status'},
+                            'color': 'red'
+                        }
+                    ]
+                )
+            ], className="train-list")
         ], className="sidebar")
     ], className="main-content"),
     
@@ -214,198 +472,121 @@ app.layout = html.Div([
     [Output('train-data-store', 'data'),
      Output('update-time', 'children')],
     [Input('interval-component', 'n_intervals'),
-     Input('refresh-button', 'n_clicks')]
+     Input('refresh-button', 'n_clicks')],
+    [State('train-data-store', 'data')]
 )
-def update_data(n_intervals, n_clicks):
-    train_data, update_time = fetch_train_locations()
-    
-    # Convert to format suitable for storage
-    serializable_data = []
-    for train in train_data:
-        train_dict = dict(train)
-        if train_dict['timestamp']:
-            train_dict['timestamp'] = train_dict['timestamp'].isoformat()
-        serializable_data.append(train_dict)
-    
-    return serializable_data, update_time
+def update_data(n_intervals, n_clicks, current_token):
+    # The refresh button still forces an immediate fetch; interval ticks just
+    # pick up whatever the background poller cached last.
+    if dash.callback_context.triggered_id == 'refresh-button':
+        fetch_train_locations()
+
+    # The parsed trains stay in the server-side cache; only a small token
+    # goes through the store to trigger the downstream callbacks.
+    _, update_time = _read_cache()
+
+    # Nothing new since the last tick: skip the map/list re-render entirely
+    if current_token and current_token.get('ts') == update_time:
+        return dash.no_update, dash.no_update
+
+    return {'ts': update_time}, update_time
+
+def _build_map_patch(trains):
+    """Patch the changing trace arrays onto the figure built at layout time.
+
+    Only lat/lon/speed change between refreshes, so the browser patches the
+    existing trace buffers instead of re-initializing the whole figure.
+    """
+    # The cached columns are already NumPy arrays; slice them directly
+    lats = trains.lats
+    lons = trains.lons
+
+    # Moving trains are blue, stopped trains are red
+    marker_colors = np.where(trains.moving, 'blue', 'red').tolist()
+
+    # Create hover text with detailed train information; each text is built
+    # with one join instead of repeated string concatenation. (The per-train
+    # "Updated: timestamp" line was removed per user's request.)
+    hover_texts = [
+        "".join((
+            f"<b>Train {train_id}</b><br>",
+            f"Speed: {speed:.1f} km/h<br>",
+            f"Position: {lat:.4f}, {lon:.4f}<br>",
+            f"Route: {route_id}<br>" if route_id else "",
+            f"Trip: {trip_id}" if trip_id else "",
+        ))
+        # .tolist() up front so the f-strings format plain Python floats,
+        # which is noticeably cheaper than formatting NumPy scalars
+        for train_id, speed, lat, lon, route_id, trip_id in zip(
+            trains.ids.tolist(), trains.speeds.tolist(), lats.tolist(),
+            lons.tolist(), trains.route_ids.tolist(), trains.trip_ids.tolist())
+    ]
+
+    patched = Patch()
+    patched['data'][0]['lat'] = lats
+    patched['data'][0]['lon'] = lons
+    patched['data'][0]['marker']['color'] = marker_colors
+    patched['data'][0]['hovertext'] = hover_texts
+    return patched
+
+def _build_train_rows(trains):
+    """Build the sidebar table rows; search filtering happens in the browser."""
+    if not len(trains):
+        return []
+
+    # Status comes from the moving mask computed once at fetch time, turned
+    # into display strings with a single vectorized np.where
+    statuses = np.where(trains.moving, "Moving", "Stopped").tolist()
 
-# Callback to update the map
+    # The cached columns are already sorted by train ID, so the rows come out
+    # in display order. One zip over plain Python lists avoids indexing the
+    # NumPy columns element by element (a boxed scalar per access).
+    return [
+        {
+            'id': train_id,
+            'speed': round(speed, 1),
+            'status': status,
+            'position': f"{lat:.4f}, {lon:.4f}",
+            'route': route_id or "",
+        }
+        for train_id, speed, status, lat, lon, route_id in zip(
+            trains.ids.tolist(), trains.speeds.tolist(), statuses,
+            trains.lats.tolist(), trains.lons.tolist(),
+            trains.route_ids.tolist())
+    ]
+
+# Single callback for both views: the cached columns are read once per
+# refresh instead of once per output. Only the interval/refresh token
+# triggers it - search keystrokes stay in the browser.
 @app.callback(
-    Output('train-map', 'figure'),
+    [Output('train-map', 'figure'),
+     Output('train-table', 'data')],
     [Input('train-data-store', 'data')]
 )
-def update_map(train_data):
-    if not train_data:
-        # Create empty map with Finland centered
-        fig = go.Figure(go.Scattermap())
-        fig.update_layout(
-            mapbox={
-                'style': "open-street-map",
-                'center': {'lat': FINLAND_CENTER['lat'], 'lon': FINLAND_CENTER['lon']},
-                'zoom': 5.5
-            },
-            margin={'l': 0, 'r': 0, 't': 0, 'b': 0}
-        )
-        return fig
-    
-    # Create the map figure
-    fig = go.Figure()
-    
-    # Convert to DataFrame for easier processing
-    train_df = pd.DataFrame(train_data)
-    
-    # Create hover text with detailed train information
-    hover_texts = []
-    for _, train in train_df.iterrows():
-        timestamp_str = train['timestamp'] if isinstance(train['timestamp'], str) else "N/A"
-        if timestamp_str and timestamp_str != "N/A":
-            try:
-                timestamp_obj = datetime.fromisoformat(timestamp_str)
-                timestamp_str = timestamp_obj.strftime("%H:%M:%S %d-%m-%Y")
-            except:
-                pass
-            
-        hover_text = f"<b>Train {train['id']}</b><br>"
-        hover_text += f"Speed: {train['speed']:.1f} km/h<br>" if pd.notna(train['speed']) else "Speed: N/A<br>"
-        hover_text += f"Position: {train['lat']:.4f}, {train['lon']:.4f}<br>"
-        
-        if pd.notna(train['route_id']):
-            hover_text += f"Route: {train['route_id']}<br>"
-        
-        if pd.notna(train['trip_id']):
-            hover_text += f"Trip: {train['trip_id']}"
-            
-        # Removed the "Updated: timestamp" line per user's request
-        
-        hover_texts.append(hover_text)
-    
-    # Define colors based on train movement
-    marker_colors = []
-    for _, train in train_df.iterrows():
-        if pd.notna(train['speed']) and train['speed'] > 0:
-            color = 'blue'  # Moving trains are blue
-        else:
-            color = 'red'   # Stopped trains are red
-            
-        marker_colors.append(color)
-    
-    # Add train markers with hover information - using Scattermap instead of deprecated Scattermapbox
-    fig.add_trace(go.Scattermap(
-        lat=train_df['lat'],
-        lon=train_df['lon'],
-        mode='markers+text',
-        marker=dict(
-            size=12,
-            color=marker_colors,
-            opacity=0.8
-        ),
-        text=train_df['id'],
-        textposition='top center',
-        textfont=dict(
-            family='Arial',
-            size=10,
-            color='black'
-        ),
-        hovertext=hover_texts,
-        hoverinfo='text',
-        hovertemplate='%{hovertext}<extra></extra>'  # Remove trace name from hover
-    ))
-    
-    # Configure the map layout - using modern 'map' property instead of 'mapbox'
-    fig.update_layout(
-        map={
-            'style': "open-street-map",
-            'center': {'lat': FINLAND_CENTER['lat'], 'lon': FINLAND_CENTER['lon']},
-            'zoom': 5.5
-        },
-        margin={'l': 0, 'r': 0, 't': 0, 'b': 0},
-        uirevision='constant',  # Preserve zoom and center position on updates
-        hoverlabel=dict(
-            bgcolor="white",
-            font_size=12,
-            font_family="Segoe UI, Arial"
-        )
-    )
-    
-    return fig
+def update_views(data_token):
+    trains, _ = _read_cache()
+    return _build_map_patch(trains), _build_train_rows(trains)
 
-# Callback to update the train list
-@app.callback(
-    Output('train-list', 'children'),
-    [Input('train-data-store', 'data'),
-     Input('train-search', 'value')]
+# Translate the search box into a DataTable filter query in the browser, so
+# typing never triggers a server round-trip. Full-numeric input keeps the
+# exact-match behavior described by the search hint; anything else falls back
+# to a case-insensitive contains filter.
+app.clientside_callback(
+    """
+    function(value) {
+        if (!value) {
+            return '';
+        }
+        value = value.trim().replace(/"/g, '');
+        if (/^\\d+$/.test(value)) {
+            return '{id} = "' + value + '"';
+        }
+        return '{id} icontains "' + value + '"';
+    }
+    """,
+    Output('train-table', 'filter_query'),
+    Input('train-search', 'value')
 )
-def update_train_list(train_data, search_value):
-    if not train_data:
-        return html.Div("No trains found", className="loading")
-    
-    # Convert to DataFrame for easier filtering and sorting
-    df = pd.DataFrame(train_data)
-    
-    # Apply search filter if specified
-    if search_value:
-        search_value = search_value.strip()  # Remove leading/trailing whitespace
-        
-        # Check if search is a numeric value
-        if search_value.isdigit():
-            # For numeric searches, use exact match if it's the full number
-            # This ensures "9" only matches train ID "9", not "149" or "92"
-            df = df[df['id'].astype(str) == search_value]
-            
-            # If no exact matches found (and search is short), try word boundary search
-            if df.empty and len(search_value) <= 3:
-                # This will match at beginning or end of ID or as a whole number
-                pattern = fr'\b{search_value}\b'
-                df = df[df['id'].astype(str).str.match(pattern, case=False)]
-                
-                # If still no matches, then fallback to contains
-                if df.empty:
-                    df = df[df['id'].astype(str).str.contains(search_value, case=False)]
-        else:
-            # For non-numeric searches, use contains as before
-            df = df[df['id'].astype(str).str.contains(search_value, case=False)]
-            
-        # Print diagnostic information
-        print(f"Search: '{search_value}', found {len(df)} matches")
-    
-    # Sort by train ID
-    df = df.sort_values('id')
-    
-    # Create list items
-    train_items = []
-    for _, train in df.iterrows():
-        # Determine train status (moving or stopped)
-        is_moving = pd.notna(train['speed']) and train['speed'] > 0
-        status_class = "moving" if is_moving else "stopped"
-        status_text = "Moving" if is_moving else "Stopped"
-        
-        train_item = html.Div([
-            html.Div([
-                html.Span(f"Train {train['id']}"),
-                html.Span(f"{train['speed']:.1f} km/h" if pd.notna(train['speed']) else "N/A")
-            ], className="train-item-header"),
-            html.Div([
-                html.Div([
-                    html.I(className="fas fa-circle", style={"color": "blue" if is_moving else "red"}),
-                    status_text
-                ]),
-                html.Div([
-                    html.I(className="fas fa-map-marker-alt"),
-                    f"{train['lat']:.4f}, {train['lon']:.4f}"
-                ]),
-                html.Div([
-                    html.I(className="fas fa-route"),
-                    train['route_id'] if pd.notna(train['route_id']) else "N/A"
-                ]) if 'route_id' in train and pd.notna(train['route_id']) else None
-            ], className="train-item-details")
-        ], className=f"train-item {status_class}")
-        
-        train_items.append(train_item)
-    
-    if not train_items:
-        return html.Div("No trains match your search", className="loading")
-    
-    return train_items
 
 # Run the app if executed directly
 if __name__ == '__main__':